@@ -1,64 +1,486 @@
 from langchain.prompts import PromptTemplate
 from langchain.vectorstores import FAISS
-from langchain.embeddings import HuggingFaceBgeEmbeddings
+from langchain.docstore.in_memory import InMemoryDocstore
+from langchain.docstore.document import Document
+from langchain.embeddings import FastEmbedEmbeddings
+from langchain.embeddings.base import Embeddings
 from dotenv import load_dotenv
 import os
 load_dotenv()
 
 from langchain_groq import ChatGroq
-from langchain.memory import ConversationSummaryBufferMemory
+from langchain.memory import ConversationSummaryBufferMemory, ConversationBufferWindowMemory
 from langchain.chains import ConversationalRetrievalChain
 from langchain.agents import initialize_agent, Tool, AgentType
 from langchain.document_loaders import TextLoader, PyMuPDFLoader, Docx2txtLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 import re
 import json
+import hashlib
+import io
+import shutil
+import tempfile
+import threading
+import docx2txt
+import fitz
+import faiss
+import numpy as np
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
 
+MIN_PREFIX_LENGTH = 3
+MAX_PREFIXES_PER_RULE = 10
+PQ_MIN_TRAINING_VECTORS = 256
+INDEX_DIR = "faiss_index"
+INDEX_CACHE_MAX_ENTRIES = 64
+DEFAULT_INDEX_KWARGS = {"hnsw_m": 32, "quantization": "fp16", "pq_m": 16}
+QUERY_CACHE_SIZE = 1024
+# Bump when prompts or chains change so earlier cached answers are not reused.
+LLM_CACHE_VERSION = "1"
+LLM_CACHE_MAX_ENTRIES = 10000
+
+
+# re.IGNORECASE treats characters as equal when their case folds agree, and
+# additionally matches dotless i with "i", which str.casefold() keeps apart.
+def _fold_case(text):
+    return text.casefold().replace("\u0131", "i")
+
+
+def _leading_literals(items):
+    prefix = ""
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            prefix += chr(av)
+        elif prefix:
+            break
+        elif op == sre_constants.AT:
+            continue
+        elif op == sre_constants.SUBPATTERN:
+            return _leading_literals(av[-1])
+        elif op == sre_constants.BRANCH:
+            prefixes = []
+            for branch in av[1]:
+                branch_prefixes = _leading_literals(branch)
+                if branch_prefixes is None:
+                    return None
+                prefixes.extend(branch_prefixes)
+            return prefixes
+        else:
+            return None
+    return [prefix]
+
+
+def _literal_prefixes(pattern):
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except re.error:
+        return None
+    prefixes = _leading_literals(parsed)
+    if not prefixes or len(prefixes) > MAX_PREFIXES_PER_RULE:
+        return None
+    if any(len(prefix) < MIN_PREFIX_LENGTH for prefix in prefixes):
+        return None
+    return sorted({_fold_case(prefix) for prefix in prefixes})
+
+
+def _build_prefilter(rules):
+    if ahocorasick is None:
+        return None, frozenset()
+    automaton = ahocorasick.Automaton()
+    prefiltered = set()
+    for label, pattern in rules.items():
+        prefixes = _literal_prefixes(pattern)
+        if prefixes is None:
+            continue
+        prefiltered.add(label)
+        for prefix in prefixes:
+            if prefix in automaton:
+                automaton.get(prefix)[1].append(label)
+            else:
+                automaton.add_word(prefix, (len(prefix), [label]))
+    if not prefiltered:
+        return None, frozenset()
+    automaton.make_automaton()
+    return automaton, frozenset(prefiltered)
+
+
+def _has_backreference(parsed):
+    stack = [parsed]
+    while stack:
+        for op, av in stack.pop():
+            if op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+                return True
+            for value in av if isinstance(av, (tuple, list)) else (av,):
+                if isinstance(value, sre_parse.SubPattern):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.extend(v for v in value if isinstance(v, sre_parse.SubPattern))
+    return False
+
+
+# Joining rules into one alternation shifts their group numbers, and inline
+# global flags such as (?x) would apply to every rule, so rules using either are
+# left out and scanned on their own.
+def _combinable(pattern):
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except re.error:
+        return False
+    if parsed.state.flags & ~(re.IGNORECASE | re.UNICODE):
+        return False
+    return not _has_backreference(parsed)
+
+
+def _build_combined(rules, labels):
+    labels = [label for label in labels if _combinable(rules[label])]
+    if not labels:
+        return None
+    alternation = "|".join(f"(?:{rules[label]})" for label in labels)
+    try:
+        return re.compile(f"(?=(?:{alternation}))", re.IGNORECASE), tuple(labels)
+    except re.error:
+        return None
+
+
+# Compiled rule sets are read-only once built, so every Analysis instance
+# loading the same rules (e.g. one per evaluation worker thread) shares them.
+@lru_cache(maxsize=None)
+def _compile_rules(rule_items):
+    rules = dict(rule_items)
+    compiled = {
+        label: re.compile(pattern, re.IGNORECASE)
+        for label, pattern in rules.items()
+    }
+    automaton, prefiltered = _build_prefilter(rules)
+    combined_all = _build_combined(rules, list(rules))
+    combined_residual = _build_combined(
+        rules, [label for label in rules if label not in prefiltered]
+    )
+    return compiled, automaton, prefiltered, combined_all, combined_residual
+
+
+class _CachedQueryEmbeddings(Embeddings):
+    def __init__(self, embeddings, maxsize=QUERY_CACHE_SIZE):
+        self.embeddings = embeddings
+        self._cached_query = lru_cache(maxsize=maxsize)(self._embed_query)
+
+    def __getattr__(self, name):
+        return getattr(self.embeddings, name)
+
+    def _embed_query(self, text):
+        return tuple(self.embeddings.embed_query(text))
+
+    def embed_documents(self, texts):
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        return list(self._cached_query(text))
+
+
+class _ResponseCache:
+    def __init__(self, path, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = None
+        self._lines = 0
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256("\x1f".join((LLM_CACHE_VERSION,) + parts).encode("utf-8")).hexdigest()
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        self._lines += 1
+                        self._remember(record["key"], record["value"])
+            except FileNotFoundError:
+                pass
+            if self._lines > len(self._entries):
+                self._compact()
+        return self._entries
+
+    def _remember(self, key, value):
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def _compact(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, value in self._entries.items():
+                f.write(json.dumps({"key": key, "value": value}) + "\n")
+        os.replace(tmp_path, self.path)
+        self._lines = len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            return self._load().get(key)
+
+    def update(self, entries):
+        if not entries:
+            return
+        with self._lock:
+            self._load()
+            with open(self.path, "a", encoding="utf-8") as f:
+                for key, value in entries.items():
+                    self._remember(key, value)
+                    f.write(json.dumps({"key": key, "value": value}) + "\n")
+            self._lines += len(entries)
+            # Appends are cheap; rewrite the file only once most lines are stale
+            if self._lines > 2 * self.max_entries:
+                self._compact()
+
+
+_response_caches = {}
+_response_caches_lock = threading.Lock()
+
+
+def _response_cache(path):
+    with _response_caches_lock:
+        cache = _response_caches.get(path)
+        if cache is None:
+            cache = _response_caches[path] = _ResponseCache(path)
+        return cache
+
+
+# The LLM clients and embedding model hold no per-document state, so callers
+# that run several Analysis instances (e.g. one per app session) can share them.
+def load_models():
+    return {
+        "llm": ChatGroq(model="llama3-70b-8192", api_key=os.getenv("GROQ_API_KEY")),
+        "llm_fast": ChatGroq(model="llama-3.1-8b-instant", api_key=os.getenv("GROQ_API_KEY"), temperature=0),
+        "embeddings": _CachedQueryEmbeddings(FastEmbedEmbeddings(
+            model_name="sentence-transformers/all-MiniLM-L6-v2",
+            threads=os.cpu_count()
+        )),
+    }
+
+
 class Analysis:
-    def __init__(self, rule_file="rules.json"):
-        self.llm = ChatGroq(model="llama3-70b-8192", api_key=os.getenv("GROQ_API_KEY"))
-        self.embeddings = HuggingFaceBgeEmbeddings(
-            model_name="all-MiniLM-L6-v2",
-            model_kwargs={"device": "cpu"}
-        )
+    def __init__(self, rule_file="rules.json", max_concurrency=16, index_kwargs=None, chat_mode=False, models=None, llm_cache_path=None, index_cache_dir=None):
+        self.max_concurrency = max_concurrency
+        self.index_cache_dir = index_cache_dir
+        self.chat_mode = chat_mode
+        self.llm_cache = _response_cache(llm_cache_path) if llm_cache_path else None
+        self.index_kwargs = {**DEFAULT_INDEX_KWARGS, **(index_kwargs or {})}
+        models = models or load_models()
+        self.llm = models["llm"]
+        self.llm_fast = models["llm_fast"]
+        self.embeddings = models["embeddings"]
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=200
         )
-        self.memory = ConversationSummaryBufferMemory(
-            llm=self.llm,
-            memory_key="chat_history",
-            return_messages=True
-        )
+        if chat_mode:
+            self.memory = ConversationSummaryBufferMemory(
+                llm=self.llm,
+                memory_key="chat_history",
+                return_messages=True
+            )
+        else:
+            self.memory = ConversationBufferWindowMemory(
+                k=0,
+                memory_key="chat_history",
+                return_messages=True
+            )
         self.vector_store = None
+        self.document_id = None
+        self.pages = []
         with open(rule_file, "r", encoding="utf-8") as f:
             self.regex_rules = json.load(f)
+        self.rules_id = hashlib.sha256(json.dumps(self.regex_rules, sort_keys=True).encode("utf-8")).hexdigest()
+        (
+            self._compiled,
+            self._automaton,
+            self._prefiltered,
+            self._combined_all,
+            self._combined_residual,
+        ) = _compile_rules(tuple(self.regex_rules.items()))
+
+    def _candidate_starts(self, text):
+        candidates = defaultdict(set)
+        covered = set()
+        combined = self._combined_all
+        if self._automaton is not None:
+            folded = _fold_case(text)
+            if len(folded) == len(text):
+                for end, (length, labels) in self._automaton.iter(folded):
+                    for label in labels:
+                        candidates[label].add(end - length + 1)
+                covered.update(self._prefiltered)
+                combined = self._combined_residual
+        if combined is not None:
+            rx, labels = combined
+            starts = [match.start() for match in rx.finditer(text)]
+            for label in labels:
+                candidates[label].update(starts)
+            covered.update(labels)
+        return candidates, covered
+
+    def _iter_pages(self, file_path, data=None):
+        if data is None:
+            if file_path.endswith('.txt'):
+                loader = TextLoader(file_path)
+            elif file_path.endswith('.pdf'):
+                loader = PyMuPDFLoader(file_path)
+            elif file_path.endswith('.docx'):
+                loader = Docx2txtLoader(file_path)
+            else:
+                raise ValueError("Unsupported file type")
+            return loader.lazy_load()
 
-    def load_documents(self, file_path):
         if file_path.endswith('.txt'):
-            loader = TextLoader(file_path)
+            text = data.decode("utf-8")
         elif file_path.endswith('.pdf'):
-            loader = PyMuPDFLoader(file_path)
+            return self._iter_pdf_pages(file_path, data)
         elif file_path.endswith('.docx'):
-            loader = Docx2txtLoader(file_path)
+            text = docx2txt.process(io.BytesIO(data))
         else:
             raise ValueError("Unsupported file type")
+        return iter([Document(page_content=text, metadata={"source": file_path})])
 
-        documents = loader.load()
-        self.raw_text = "\n".join(doc.page_content for doc in documents)
-        chunks = self.text_splitter.split_documents(documents)
+    def _iter_pdf_pages(self, file_path, data):
+        with fitz.open(stream=data, filetype="pdf") as pdf:
+            for page in pdf:
+                yield Document(
+                    page_content=page.get_text(),
+                    metadata={"source": file_path, "page": page.number}
+                )
 
-        self.vector_store = FAISS.from_documents(
-            documents=chunks,
-            embedding=self.embeddings
-        )
-        self.vector_store.save_local("faiss_index")
+    def _ingest(self, documents):
+        documents = list(documents)
+        self.memory.clear()
+        self.pages = [document.page_content for document in documents]
+        return documents
+
+    def load_documents(self, file_path, data=None):
+        self._build_vector_store(self._ingest(self._iter_pages(file_path, data)))
+
+    def _build_vector_store(self, documents):
+        digest = self._index_digest()
+        for i, document in enumerate(documents):
+            if i:
+                digest.update(b"\n")
+            digest.update(document.page_content.encode("utf-8"))
+
+        self.document_id = digest.hexdigest()
+        self.vector_store = None
+        index_path = None
+        if self.index_cache_dir:
+            index_path = os.path.join(self.index_cache_dir, self.document_id[:16])
+            if os.path.isdir(index_path):
+                try:
+                    self.vector_store = FAISS.load_local(
+                        index_path,
+                        self.embeddings,
+                        allow_dangerous_deserialization=True
+                    )
+                    os.utime(index_path)
+                except Exception:
+                    # An unreadable entry is rebuilt and overwritten below
+                    self.vector_store = None
+
+        if self.vector_store is None:
+            chunks = self.text_splitter.split_documents(documents)
+            texts = [chunk.page_content for chunk in chunks]
+            vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+
+            self.vector_store = FAISS(
+                embedding_function=self.embeddings,
+                index=self._build_index(vectors),
+                docstore=InMemoryDocstore(),
+                index_to_docstore_id={}
+            )
+            self.vector_store.add_embeddings(
+                zip(texts, vectors),
+                metadatas=[chunk.metadata for chunk in chunks]
+            )
+            if index_path is not None:
+                self._save_index(index_path)
 
         self._setup_analysis_chain()
         print("Document processed and ready for questions")
 
+    # Indexes are written to a temporary directory and moved into place, so a
+    # reader never sees a partially written entry.
+    def _save_index(self, index_path):
+        os.makedirs(self.index_cache_dir, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(prefix=".tmp-", dir=self.index_cache_dir)
+        try:
+            self.vector_store.save_local(tmp_path)
+            shutil.rmtree(index_path, ignore_errors=True)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+        self._prune_index_cache()
+
+    def _prune_index_cache(self):
+        entries = []
+        for name in os.listdir(self.index_cache_dir):
+            path = os.path.join(self.index_cache_dir, name)
+            if not name.startswith(".") and os.path.isdir(path):
+                entries.append((os.path.getmtime(path), path))
+        entries.sort(reverse=True)
+        for _, path in entries[INDEX_CACHE_MAX_ENTRIES:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _index_digest(self):
+        digest = hashlib.sha256()
+        digest.update(self.embeddings.model_name.encode("utf-8"))
+        settings = {
+            "max_length": getattr(self.embeddings, "max_length", None),
+            "doc_embed_type": getattr(self.embeddings, "doc_embed_type", None),
+        }
+        digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        digest.update(json.dumps(self.index_kwargs, sort_keys=True).encode("utf-8"))
+        return digest
+
+    def _build_index(self, vectors):
+        dim = vectors.shape[1]
+        hnsw_m = self.index_kwargs["hnsw_m"]
+        quantization = self.index_kwargs["quantization"]
+        if quantization == "pq" and len(vectors) < PQ_MIN_TRAINING_VECTORS:
+            quantization = "fp16"
+
+        if quantization is None:
+            index = faiss.IndexHNSWFlat(dim, hnsw_m)
+        elif quantization == "fp16":
+            index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_fp16, hnsw_m)
+        elif quantization == "int8":
+            index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, hnsw_m)
+        elif quantization == "pq":
+            index = faiss.IndexHNSWPQ(dim, self.index_kwargs["pq_m"], hnsw_m)
+        else:
+            raise ValueError(f"Unsupported index quantization: {quantization}")
+
+        if not index.is_trained:
+            index.train(vectors)
+        return index
+
     def _setup_analysis_chain(self):
         self.analysis_chain = ConversationalRetrievalChain.from_llm(
             llm=self.llm,
@@ -74,13 +496,13 @@ class Analysis:
 
         tool_rule = Tool(
             name="RuleScanner",
-            func=lambda query: self.rule_based_scan(self.raw_text),
+            func=lambda query: self.rule_based_scan(),
             description="Scans the document for rule violations using predefined regex rules."
         )
 
         tool_risk = Tool(
             name="RiskAssessor",
-            func=lambda query: self.assess_risk_level(self.rule_based_scan(self.raw_text)),
+            func=lambda query: self.assess_risk_level(self.rule_based_scan()),
             description="Assesses the overall compliance risk level."
         )
 
@@ -93,29 +515,110 @@ class Analysis:
             handle_parsing_errors=True
         )
 
+    # With an LLM cache configured, answers outside chat mode depend only on the
+    # model, rules, document and query, so they are reused across runs.
+    def _cached_answer(self, parts, compute):
+        if self.chat_mode or self.llm_cache is None:
+            return compute()
+        cache_key = self.llm_cache.key(*parts)
+        answer = self.llm_cache.get(cache_key)
+        if answer is None:
+            answer = compute()
+            self.llm_cache.update({cache_key: answer})
+        return answer
+
     def ask_query(self, query):
-        return self.agent.run(query)
-
-    def _extract_context(self, text, start, end, window=100):
-        left = max(start - window, 0)
-        right = min(end + window, len(text))
-        return text[left:right]
-
-    def rule_based_scan(self, text):
-        flagged = []
-        for label, pattern in self.regex_rules.items():
-            matches = re.finditer(pattern, text, flags=re.IGNORECASE)
-            for match in matches:
-                matched_text = match.group()
-                context = self._extract_context(text, match.start(), match.end())
-                prompt = f"In the following policy text, does this indicate a violation of '{label}'?\n\n\"{context}\""
-                response = self.llm.invoke(prompt)
-                flagged.append({
-                    "rule": label,
-                    "match": matched_text,
-                    "context": context,
-                    "llm_judgment": response
-                })
+        return self._cached_answer(
+            ("agent", self.llm.model_name, self.rules_id, self.document_id, query),
+            lambda: self.agent.run(query)
+        )
+
+    def summarize(self, query):
+        return self._cached_answer(
+            ("summary", self.llm.model_name, self.document_id, query),
+            lambda: self.analysis_chain.invoke({"question": query})["answer"]
+        )
+
+    def _extract_contexts(self, text, spans, window=100):
+        if not spans:
+            return []
+        bounds = np.asarray(spans, dtype=np.int64)
+        lefts = np.maximum(bounds[:, 0] - window, 0)
+        rights = np.minimum(bounds[:, 1] + window, len(text))
+        contexts = {}
+        result = []
+        for left, right in zip(lefts.tolist(), rights.tolist()):
+            context = contexts.get((left, right))
+            if context is None:
+                context = contexts[(left, right)] = text[left:right]
+            result.append(context)
+        return result
+
+    def _iter_rule_matches(self, text, rx, starts):
+        last_end = -1
+        for start in sorted(starts):
+            if start < last_end:
+                continue
+            match = rx.match(text, start)
+            if match:
+                last_end = match.end()
+                yield match
+
+    def _collect_matches(self, text):
+        candidates, covered = self._candidate_starts(text)
+        found = []
+        for label, rx in self._compiled.items():
+            if label in covered:
+                hits = self._iter_rule_matches(text, rx, candidates.get(label, ()))
+            else:
+                hits = rx.finditer(text)
+            found.extend((label, match) for match in hits)
+
+        contexts = self._extract_contexts(text, [match.span() for _, match in found])
+        return [
+            {"rule": label, "match": match.group(), "context": context}
+            for (label, match), context in zip(found, contexts)
+        ]
+
+    def _verdict_prompt(self, match):
+        return f"In the following policy text, does this indicate a violation of '{match['rule']}'?\n\n\"{match['context']}\""
+
+    def rule_based_scan(self, text=None):
+        # Pages are scanned as one text so that rules can match across page breaks.
+        if text is None:
+            text = "\n".join(self.pages)
+        flagged = self._collect_matches(text)
+
+        prompts = {}
+        for match in flagged:
+            key = (match["rule"], match["context"])
+            if key not in prompts:
+                prompts[key] = self._verdict_prompt(match)
+
+        verdicts = {}
+        pending = {}
+        for key, prompt in prompts.items():
+            cache_key = None
+            if self.llm_cache is not None:
+                cache_key = self.llm_cache.key("verdict", self.llm_fast.model_name, prompt)
+                cached = self.llm_cache.get(cache_key)
+                if cached is not None:
+                    verdicts[key] = cached
+                    continue
+            pending[key] = (cache_key, prompt)
+
+        responses = []
+        if pending:
+            responses = self.llm_fast.batch(
+                [prompt for _, prompt in pending.values()],
+                config={"max_concurrency": self.max_concurrency}
+            )
+        for key, response in zip(pending, responses):
+            verdicts[key] = response.content
+        if self.llm_cache is not None:
+            self.llm_cache.update({cache_key: verdicts[key] for key, (cache_key, _) in pending.items()})
+        for match in flagged:
+            match["llm_judgment"] = verdicts[(match["rule"], match["context"])]
         return flagged
 
     def assess_risk_level(self, violations):
@@ -136,11 +639,21 @@ class Analysis:
         else:
             return "Low"
 
-    def analyze_file(self, file_path, query=None):
-        self.load_documents(file_path)
-        rule_violations = self.rule_based_scan(self.raw_text)
+    def analyze_file(self, file_path, query=None, data=None):
+        return self._analyze(self._iter_pages(file_path, data), query)
+
+    def analyze_text(self, text, query=None):
+        return self._analyze([Document(page_content=text)], query)
+
+    def _analyze(self, documents, query=None):
+        documents = self._ingest(documents)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            index_future = executor.submit(self._build_vector_store, documents)
+            scan_future = executor.submit(self.rule_based_scan)
+            rule_violations = scan_future.result()
+            index_future.result()
         risk_level = self.assess_risk_level(rule_violations)
-        ai_summary = self.ask_query(query or "Summarize all compliance risks in the document.")
+        ai_summary = self.summarize(query or "Summarize all compliance risks in the document.")
         return {
             "rule_based_violations": rule_violations,
             "ai_summary": ai_summary,
@@ -148,7 +661,7 @@ class Analysis:
         }
 
 def main():
-    analysis = Analysis(rule_file="rules.json")
+    analysis = Analysis(rule_file="rules.json", index_cache_dir=INDEX_DIR)
 
     file_path = input("Enter the path to the document file (default: example_policy.txt): ").strip()
     if not file_path:
@@ -2,7 +2,7 @@ import streamlit as st
 import json
 import os
 import tempfile
-from analyzer import Analysis
+from analyzer import Analysis, load_models
 import html
 
 st.set_page_config(
@@ -46,12 +46,28 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_models():
+    return load_models()
+
+def get_analyzer(rules_path):
+    # Analysis keeps per-document state, so each session gets its own instance;
+    # only the read-only models are shared across sessions
+    if st.session_state.analysis is None or st.session_state.analysis_rules_path != rules_path:
+        st.session_state.analysis = Analysis(rule_file=rules_path, models=get_models())
+        st.session_state.analysis_rules_path = rules_path
+    return st.session_state.analysis
+
 if 'analysis' not in st.session_state:
     st.session_state.analysis = None
+    st.session_state.analysis_rules_path = None
 if 'results' not in st.session_state:
     st.session_state.results = None
 if 'rules_path' not in st.session_state:
     st.session_state.rules_path = None
+if 'custom_rules_id' not in st.session_state:
+    st.session_state.custom_rules_id = None
+    st.session_state.custom_rules_path = None
 
 st.markdown("<div class='main-header'>Compliance Analysis Tool</div>", unsafe_allow_html=True)
 
@@ -61,9 +77,12 @@ use_custom_rules = st.checkbox("Use custom rules file (optional)", value=False)
 if use_custom_rules:
     rules_file = st.file_uploader("Upload custom rules file (JSON, TXT, YAML)", type=["json", "txt", "yaml", "yml"])
     if rules_file:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{rules_file.name.split('.')[-1]}") as tmp_rule:
-            tmp_rule.write(rules_file.read())
-            st.session_state.rules_path = tmp_rule.name
+        if st.session_state.custom_rules_id != rules_file.file_id:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{rules_file.name.split('.')[-1]}") as tmp_rule:
+                tmp_rule.write(rules_file.read())
+                st.session_state.custom_rules_path = tmp_rule.name
+            st.session_state.custom_rules_id = rules_file.file_id
+        st.session_state.rules_path = st.session_state.custom_rules_path
         st.info("Using uploaded rules file.")
     else:
         st.warning("Please upload a custom rules file.")
@@ -75,22 +94,25 @@ else:
     else:
         st.error("Default rules.json file not found.")
 
+if st.button("Reload rules"):
+    st.session_state.analysis = None
+    st.info("Rules will be reloaded on the next analysis.")
+
 st.subheader("Upload Policy Document")
 uploaded_file = st.file_uploader("Choose a document (TXT, PDF, DOCX)", type=['txt', 'pdf', 'docx'])
 
 custom_query = st.text_area("Custom Query", "Summarize all compliance risks in the document.")
 
 if uploaded_file and st.session_state.rules_path:
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-        tmp_file.write(uploaded_file.getvalue())
-        tmp_path = tmp_file.name
-
     if st.button("Analyze"):
         try:
-            st.session_state.analysis = Analysis(rule_file=st.session_state.rules_path)
-            results = st.session_state.analysis.analyze_file(tmp_path, custom_query)
+            st.session_state.analysis = get_analyzer(st.session_state.rules_path)
+            results = st.session_state.analysis.analyze_file(
+                uploaded_file.name,
+                custom_query,
+                data=uploaded_file.getvalue()
+            )
             st.session_state.results = results
-            os.unlink(tmp_path)
             st.success("Analysis completed successfully.")
         except Exception as e:
             st.error(f"Error during analysis: {e}")